@@ -1,181 +1,359 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from aiolimiter import AsyncLimiter
 import time
 import os
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import sys
 import re
-from datetime import datetime, timedelta
-from urllib.parse import urljoin, urlparse
+import json
+import tempfile
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urljoin
+
+log = logging.getLogger('aljarida')
+
+# Shared S3 client settings: keep-alive sockets and adaptive retries.
+# The connection pool size is set per client from the upload concurrency.
+_BOTO_CFG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_s3(aws_access_key, aws_secret_key, max_pool_connections):
+    """Return a shared S3 client per credential pair so its connection pool is reused"""
+    return boto3.client(
+        's3',
+        aws_access_key_id=aws_access_key,
+        aws_secret_access_key=aws_secret_key,
+        config=_BOTO_CFG.merge(Config(max_pool_connections=max_pool_connections))
+    )
+
+
+# Date in preview text like "النسخة الورقية 2026-01-29"
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+# Day partition in S3 keys like ".../day=29/magazinepdf/file.pdf"
+_DAY_RE = re.compile(r"day=(\d+)")
+
+# Write the checkpoint at most once per this many processed days
+_CHECKPOINT_EVERY_DAYS = 10
 
 
 class AljaridaPDFScraper:
-    def __init__(self, aws_access_key=None, aws_secret_key=None, bucket_name=None):
+    def __init__(self, aws_access_key=None, aws_secret_key=None, bucket_name=None, max_concurrency=10, max_requests_per_second=5):
         self.base_url = "https://www.aljarida.com"
+        self.max_concurrency = max_concurrency
+        
+        # Token bucket for requests to the site: bursts within quota don't wait.
+        # Rates below 1/s become one request per 1/rate seconds, since a bucket
+        # must hold at least one whole token.
+        if max_requests_per_second <= 0:
+            raise ValueError(f"max_requests_per_second must be positive, got {max_requests_per_second}")
+        if max_requests_per_second >= 1:
+            self.limiter = AsyncLimiter(max_rate=max_requests_per_second, time_period=1)
+        else:
+            self.limiter = AsyncLimiter(max_rate=1, time_period=1 / max_requests_per_second)
+        
+        # Event loop the limiter runs on while scrape_and_upload is active
+        self._loop = None
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+        # Pool sized for concurrent downloads; retries/backoff happen in urllib3
+        adapter = HTTPAdapter(
+            pool_connections=50,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'HEAD']
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Cache for month pages to avoid refetching
         self.month_cache = {}
         
+        # Cache of days already uploaded to S3, per (year, month)
+        self.existing_cache = {}
+        
+        # Checkpoint date not yet written to S3
+        self._pending_checkpoint = None
+        
         # AWS S3 configuration
         self.bucket_name = bucket_name
+        
+        # Upload larger PDFs as parallel multipart chunks
+        self.transfer_cfg = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=10,
+            use_threads=True
+        )
+        
         if aws_access_key and aws_secret_key:
-            print(f"\nInitializing S3 client...")
-            print(f"Access Key: {aws_access_key[:8]}...{aws_access_key[-4:]}")
-            print(f"Bucket: {bucket_name}")
+            log.info("Initializing S3 client...")
+            log.info("Access Key: %s...%s", aws_access_key[:8], aws_access_key[-4:])
+            log.info("Bucket: %s", bucket_name)
             
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key
+            # Every concurrent upload can run transfer_cfg.max_concurrency part
+            # requests at once; size the pool so none of them wait or get discarded
+            self.s3_client = _get_s3(
+                aws_access_key,
+                aws_secret_key,
+                max_pool_connections=self.max_concurrency * self.transfer_cfg.max_concurrency
             )
             
             # Test the connection
             try:
-                print("\nTesting S3 connection...")
+                log.info("Testing S3 connection...")
                 self.s3_client.head_bucket(Bucket=bucket_name)
-                print(f"✓ Successfully connected to S3 bucket: {bucket_name}")
+                log.info("✓ Successfully connected to S3 bucket: %s", bucket_name)
             except Exception as e:
-                print(f"✗ Failed to connect to S3: {e}")
-                print(f"\nPlease check:")
-                print(f"1. The AWS Access Key exists in IAM (not deleted/deactivated)")
-                print(f"2. The Secret Key matches the Access Key")
-                print(f"3. The IAM user has s3:PutObject permission for bucket '{bucket_name}'")
+                log.error("✗ Failed to connect to S3: %s", e)
+                log.error("Please check:")
+                log.error("1. The AWS Access Key exists in IAM (not deleted/deactivated)")
+                log.error("2. The Secret Key matches the Access Key")
+                log.error("3. The IAM user has s3:PutObject permission for bucket '%s'", bucket_name)
                 raise
         else:
             self.s3_client = None
     
-    def get_page_content(self, url, max_retries=3):
-        """Fetch page content with retry logic"""
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                response.encoding = 'utf-8'
-                return response.text
-            except Exception as e:
-                print(f"Error fetching {url} (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    return None
-        return None
+    def _wait_for_rate_limit(self):
+        """Block the calling worker thread until the limiter allows one more request"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.limiter.acquire(), self._loop).result()
+    
+    def get_page_content(self, url):
+        """Fetch raw page bytes (retries are handled by the session adapter)"""
+        try:
+            self._wait_for_rate_limit()
+            response = self.session.get(url, timeout=(5, 30))
+            response.raise_for_status()
+        except Exception as e:
+            log.warning("Error fetching %s: %s", url, e)
+            return None
+        
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type:
+            log.warning("Unexpected content type for %s: %s", url, content_type)
+            return None
+        
+        # Left undecoded: LexborHTMLParser reads bytes as UTF-8 in C, ignoring
+        # <meta charset>, which keeps the old response.encoding = 'utf-8' behaviour
+        return response.content
+    
+    def get_month_cache_key(self, year, month):
+        """Get S3 key for a cached month index"""
+        return f"aljarida/_cache/month_{year}-{month:02d}.json"
+    
+    def load_month_cache(self, year, month):
+        """Load a month index from S3 if the cached copy is still fresh"""
+        if self.s3_client is None or self.bucket_name is None:
+            return None
+        
+        try:
+            obj = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self.get_month_cache_key(year, month)
+            )
+        except Exception:
+            return None
+        
+        # An index cached after the month ended is complete and can be kept for
+        # a month; one cached while the month was still running goes stale daily
+        next_month = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+        last_modified = obj['LastModified']
+        if last_modified >= next_month + timedelta(days=1):
+            max_age = timedelta(days=30)
+        else:
+            max_age = timedelta(days=1)
+        
+        if datetime.now(timezone.utc) - last_modified > max_age:
+            return None
+        
+        try:
+            return json.loads(obj['Body'].read().decode('utf-8'))
+        except Exception:
+            return None
+    
+    def save_month_cache(self, year, month, date_to_pdf):
+        """Save a month index to S3 so later runs can skip the month page"""
+        if self.s3_client is None or self.bucket_name is None:
+            return
+        
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=self.get_month_cache_key(year, month),
+                Body=json.dumps(date_to_pdf).encode('utf-8'),
+                ContentType='application/json'
+            )
+        except Exception as e:
+            log.warning("Failed to cache month index: %s", e)
     
     def scrape_pdf_month_index(self, year, month):
         """Scrape month page and return dict of date -> pdf_url"""
         cache_key = f"{year}-{month:02d}"
         
         if cache_key in self.month_cache:
-            print(f"Using cached data for {cache_key}")
+            log.debug("Using cached data for %s", cache_key)
             return self.month_cache[cache_key]
         
+        cached = self.load_month_cache(year, month)
+        if cached is not None:
+            log.info("Using S3 cached data for %s (%d PDFs)", cache_key, len(cached))
+            self.month_cache[cache_key] = cached
+            return cached
+        
         url = f"{self.base_url}/الأعداد-السابقة?monthFilter={year}-{month:02d}"
-        print(f"\nScraping PDF archive: {url}")
+        log.info("Scraping PDF archive: %s", url)
         
         html = self.get_page_content(url)
         if not html:
             self.month_cache[cache_key] = {}
             return {}
         
-        soup = BeautifulSoup(html, "html.parser")
-        pdf_widget = soup.find("div", class_="aljarida-archive-pdf")
+        tree = LexborHTMLParser(html)
+        pdf_widget = tree.css_first("div.aljarida-archive-pdf")
         
         date_to_pdf = {}
         
         if not pdf_widget:
-            print(f"No PDF widget found for {year}-{month:02d}")
+            log.warning("No PDF widget found for %d-%02d", year, month)
             self.month_cache[cache_key] = {}
             return {}
         
-        previews = pdf_widget.find_all("div", class_="pdf-preview")
-        print(f"Found {len(previews)} PDF previews")
+        previews = pdf_widget.css("div.pdf-preview")
+        log.info("Found %d PDF previews", len(previews))
         
         for preview in previews:
-            date_div = preview.find("div", class_="date")
-            pdf_link = preview.find("a", href=True)
+            date_div = preview.css_first("div.date")
+            pdf_link = preview.css_first("a[href]")
             
             if not date_div or not pdf_link:
                 continue
             
             # Extract date from text like "النسخة الورقية<br>2026-01-29"
-            date_text = date_div.get_text(" ", strip=True)
-            match = re.search(r"(\d{4}-\d{2}-\d{2})", date_text)
+            date_text = date_div.text(separator=" ", strip=True)
+            match = _DATE_RE.search(date_text)
             
             if not match:
                 continue
             
             date_str = match.group(1)
-            pdf_url = urljoin(self.base_url, pdf_link["href"])
+            pdf_url = urljoin(self.base_url, pdf_link.attributes["href"])
             date_to_pdf[date_str] = pdf_url
-            print(f"  {date_str}: {pdf_url}")
+            log.debug("%s: %s", date_str, pdf_url)
         
         self.month_cache[cache_key] = date_to_pdf
+        if date_to_pdf:
+            self.save_month_cache(year, month, date_to_pdf)
         return date_to_pdf
     
     def upload_pdf_to_s3(self, pdf_url, year, month, day):
         """Download PDF and upload to S3"""
         if self.s3_client is None or self.bucket_name is None:
-            print("S3 client not configured, skipping upload")
+            log.warning("S3 client not configured, skipping upload")
             return False
         
-        # Extract filename from URL
-        filename = os.path.basename(urlparse(pdf_url).path)
-        if not filename or not filename.endswith('.pdf'):
+        # Extract filename from URL (last path segment, without query string)
+        filename = pdf_url.rsplit('/', 1)[-1].split('?', 1)[0]
+        if not filename.endswith('.pdf'):
             filename = f"aljarida-{year}{month:02d}{day:02d}-1.pdf"
         
-        # Remove query string from filename
-        filename = filename.split('?')[0]
-        
         s3_key = f"aljarida/year={year}/month={month:02d}/day={day:02d}/magazinepdf/{filename}"
         
         try:
             # Check if PDF already exists in S3
             try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
-                print(f"✓ PDF already exists: s3://{self.bucket_name}/{s3_key}")
-                return True
+                head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+                remote_size = head['ContentLength']
             except Exception:
-                pass  # PDF doesn't exist, continue with upload
-            
-            # Download PDF
-            print(f"Downloading PDF: {pdf_url}")
-            response = self.session.get(pdf_url, timeout=60)
-            response.raise_for_status()
-            
-            # Get PDF content
-            pdf_content = response.content
+                remote_size = None  # PDF doesn't exist, continue with upload
             
-            # Check if content is valid
-            if len(pdf_content) == 0:
-                print(f"✗ Downloaded PDF is empty (0 bytes)")
-                return False
-            
-            # Get content size
-            size_mb = len(pdf_content) / (1024 * 1024)
-            print(f"PDF size: {size_mb:.2f} MB")
-            
-            # Verify it's actually a PDF file
-            if not pdf_content.startswith(b'%PDF'):
-                print(f"✗ Downloaded file is not a valid PDF (missing PDF header)")
-                return False
+            if remote_size is not None:
+                # Compare against the source size so an empty or mismatched object is
+                # redone. Days with a non-empty object in the month listing are skipped
+                # before this point, so this only covers empty objects and the case
+                # where the listing failed.
+                try:
+                    self._wait_for_rate_limit()
+                    probe = self.session.head(pdf_url, timeout=10, allow_redirects=True)
+                    src_size = int(probe.headers.get('Content-Length', 0))
+                except Exception:
+                    src_size = 0
+                
+                if src_size > 0 and remote_size == src_size:
+                    log.info("✓ PDF already exists: s3://%s/%s", self.bucket_name, s3_key)
+                    return True
+                if src_size == 0 and remote_size > 0:
+                    # Source size unknown, trust the existing non-empty object
+                    log.info("✓ PDF already exists: s3://%s/%s", self.bucket_name, s3_key)
+                    return True
+                log.info("S3 object size (%s) differs from source (%s), re-downloading", remote_size, src_size)
             
-            # Upload to S3
-            print(f"Uploading to s3://{self.bucket_name}/{s3_key}...")
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=pdf_content,
-                ContentType='application/pdf'
-            )
+            # Stream the PDF to a spooled temp file in 1 MiB chunks so the
+            # transfer manager can upload it as parallel multipart parts
+            log.debug("Downloading PDF: %s", pdf_url)
+            self._wait_for_rate_limit()
+            with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as buf:
+                with self.session.get(pdf_url, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        buf.write(chunk)
+                
+                # Check if content is valid
+                size_bytes = buf.tell()
+                if size_bytes == 0:
+                    log.error("✗ Downloaded PDF is empty (0 bytes): %s", pdf_url)
+                    return False
+                
+                # Get content size
+                size_mb = size_bytes / (1024 * 1024)
+                log.debug("PDF size: %.2f MB", size_mb)
+                
+                # Verify it's actually a PDF file
+                buf.seek(0)
+                if buf.read(4) != b'%PDF':
+                    log.error("✗ Downloaded file is not a valid PDF (missing PDF header): %s", pdf_url)
+                    return False
+                
+                # Upload to S3
+                buf.seek(0)
+                log.debug("Uploading to s3://%s/%s...", self.bucket_name, s3_key)
+                self.s3_client.upload_fileobj(
+                    buf,
+                    self.bucket_name,
+                    s3_key,
+                    Config=self.transfer_cfg,
+                    ExtraArgs={'ContentType': 'application/pdf'}
+                )
             
-            print(f"✓ Uploaded PDF: s3://{self.bucket_name}/{s3_key}")
+            log.info("✓ Uploaded PDF: s3://%s/%s", self.bucket_name, s3_key)
             return True
             
         except Exception as e:
-            print(f"✗ Error uploading PDF: {e}")
+            log.error("✗ Error uploading PDF %s: %s", pdf_url, e)
             return False
     
     def get_checkpoint_key(self):
@@ -209,100 +387,231 @@ class AljaridaPDFScraper:
                 Body=date_value.strftime('%Y-%m-%d').encode('utf-8')
             )
         except Exception as e:
-            print(f"Warning: failed to update checkpoint: {e}")
+            log.warning("Failed to update checkpoint: %s", e)
     
-    def scrape_and_upload(self, start_date, end_date=None, max_days_per_run=50, max_runtime_minutes=330):
-        """Scrape PDFs and upload to S3 with runtime limits - Goes BACKWARDS from recent to old"""
-        if end_date is None:
-            end_date = datetime(2007, 6, 1)  # Earliest date
-        
-        # Check if we've already gone past the end date
-        if start_date < end_date:
-            print(f"\n{'='*60}")
-            print(f"Already completed! Start date ({start_date.strftime('%Y-%m-%d')}) is before end date ({end_date.strftime('%Y-%m-%d')})")
-            print(f"All PDFs from {end_date.strftime('%Y-%m-%d')} onwards have been processed.")
-            print(f"{'='*60}\n")
+    def flush_checkpoint(self):
+        """Write the pending checkpoint date to S3, if there is one"""
+        if self._pending_checkpoint is None:
             return
         
-        current_date = start_date
-        total_uploaded = 0
-        total_skipped = 0
-        total_failed = 0
-        started_at = time.time()
+        self.set_last_checkpoint_date(self._pending_checkpoint)
+        self._pending_checkpoint = None
+    
+    def _existing_days(self, year, month):
+        """Return the set of days in a month that already have a PDF in S3"""
+        if (year, month) in self.existing_cache:
+            return self.existing_cache[(year, month)]
+        
+        if self.s3_client is None or self.bucket_name is None:
+            return set()
+        
+        existing = set()
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=f"aljarida/year={year}/month={month:02d}/"
+            ):
+                for obj in page.get('Contents', []):
+                    match = _DAY_RE.search(obj['Key'])
+                    # Empty objects are left to the size check in upload_pdf_to_s3
+                    if match and obj['Key'].endswith('.pdf') and obj.get('Size', 0) > 0:
+                        existing.add(int(match.group(1)))
+        except Exception as e:
+            # Fall back to the per-object check in upload_pdf_to_s3
+            log.warning("Failed to list existing PDFs for %d-%02d: %s", year, month, e)
+            return set()
+        
+        self.existing_cache[(year, month)] = existing
+        return existing
+    
+    async def fetch_month(self, semaphore, year, month):
+        """Fetch the PDF index for a month without blocking the event loop"""
+        async with semaphore:
+            return await asyncio.to_thread(self.scrape_pdf_month_index, year, month)
+    
+    async def prefetch_month(self, semaphore, year, month):
+        """Fetch a month's PDF index and the set of its days already in S3"""
+        pdf_index = await self.fetch_month(semaphore, year, month)
+        existing_days = await asyncio.to_thread(self._existing_days, year, month)
+        return pdf_index, existing_days
+    
+    async def fetch_and_upload_pdf(self, semaphore, date_value, pdf_url, existing_days, started_at, max_runtime_minutes):
+        """Process a single day: returns 'uploaded', 'existing', 'skipped', 'failed', or None if not started"""
+        date_str = date_value.strftime('%Y-%m-%d')
         
-        print(f"\n{'='*60}")
-        print(f"PDF Scraper Started (BACKWARDS: recent → old)")
-        print(f"Starting from: {start_date.strftime('%Y-%m-%d')}")
-        print(f"Going back to: {end_date.strftime('%Y-%m-%d')}")
-        print(f"Max days per run: {max_days_per_run}")
-        print(f"Max runtime: {max_runtime_minutes} minutes")
-        print(f"{'='*60}\n")
+        if not pdf_url:
+            log.info("No PDF found for %s", date_str)
+            return 'skipped'
         
-        while current_date >= end_date:
+        # Non-empty objects from the month listing are trusted without a size check
+        if date_value.day in existing_days:
+            log.info("✓ PDF already exists for %s", date_str)
+            return 'existing'
+        
+        async with semaphore:
+            # Don't start new downloads once the runtime budget is spent
+            if (time.time() - started_at) / 60 >= max_runtime_minutes:
+                return None
+            
             try:
-                # Check runtime and day limits
+                success = await asyncio.to_thread(
+                    self.upload_pdf_to_s3,
+                    pdf_url,
+                    date_value.year,
+                    date_value.month,
+                    date_value.day
+                )
+            except Exception as e:
+                log.error("Error processing %s: %s", date_str, e)
+                return 'failed'
+        
+        return 'uploaded' if success else 'failed'
+    
+    async def _scrape_and_upload_async(self, dates, max_runtime_minutes, started_at):
+        """Process dates month by month, downloading each month's PDFs concurrently"""
+        totals = {'uploaded': 0, 'skipped': 0, 'failed': 0}
+        semaphore = asyncio.BoundedSemaphore(self.max_concurrency)
+        
+        # asyncio.to_thread uses the default executor, which is capped at
+        # min(32, cpu_count + 4) workers; size it so max_concurrency is reachable
+        # Worker threads take a limiter token (on this loop) before each request
+        self._loop = asyncio.get_running_loop()
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrency)
+        )
+        
+        # Group dates by month, keeping the newest-first order
+        months = {}
+        for date_value in dates:
+            months.setdefault((date_value.year, date_value.month), []).append(date_value)
+        
+        # Fetch every month index and S3 listing for this run up front, so the
+        # per-day work below only does PDF downloads and uploads
+        log.info("Prefetching %d month indexes...", len(months))
+        results = await asyncio.gather(
+            *(self.prefetch_month(semaphore, year, month) for year, month in months),
+            return_exceptions=True
+        )
+        prefetched = dict(zip(months, results))
+        
+        # Checkpoint writes are batched; whatever is pending is written on exit,
+        # including when the run is interrupted
+        days_since_flush = 0
+        try:
+            for (year, month), month_dates in months.items():
                 elapsed_minutes = (time.time() - started_at) / 60
-                total_days = total_uploaded + total_skipped + total_failed
-                
-                if total_days >= max_days_per_run:
-                    print(f"\nReached max days per run: {max_days_per_run}")
-                    break
-                
                 if elapsed_minutes >= max_runtime_minutes:
-                    print(f"\nReached max runtime: {max_runtime_minutes} minutes")
+                    log.info("Reached max runtime: %d minutes", max_runtime_minutes)
                     break
                 
-                print(f"\n{'='*60}")
-                print(f"Processing date: {current_date.strftime('%Y-%m-%d')}")
-                print(f"{'='*60}")
+                log.info("=" * 60)
+                log.info("Processing month: %d-%02d (%d days)", year, month, len(month_dates))
+                log.info("=" * 60)
                 
-                # Get PDF index for this month
-                pdf_index = self.scrape_pdf_month_index(current_date.year, current_date.month)
+                month_data = prefetched[(year, month)]
+                if isinstance(month_data, Exception):
+                    log.error("Error processing %d-%02d: %s", year, month, month_data)
+                    totals['failed'] += len(month_dates)
+                    continue
+                pdf_index, existing_days = month_data
                 
-                # Check if PDF exists for this date
-                date_str = current_date.strftime('%Y-%m-%d')
-                pdf_url = pdf_index.get(date_str)
-                
-                if pdf_url:
-                    success = self.upload_pdf_to_s3(
-                        pdf_url,
-                        current_date.year,
-                        current_date.month,
-                        current_date.day
+                results = await asyncio.gather(*(
+                    self.fetch_and_upload_pdf(
+                        semaphore,
+                        date_value,
+                        pdf_index.get(date_value.strftime('%Y-%m-%d')),
+                        existing_days,
+                        started_at,
+                        max_runtime_minutes
                     )
-                    
-                    if success:
-                        total_uploaded += 1
-                        # Update checkpoint after successful upload
-                        self.set_last_checkpoint_date(current_date)
-                    else:
-                        total_failed += 1
-                else:
-                    print(f"No PDF found for {date_str}")
-                    total_skipped += 1
+                    for date_value in month_dates
+                ))
                 
-                # Move to PREVIOUS day (going backwards)
-                current_date -= timedelta(days=1)
+                # Checkpoint the oldest successful date of the contiguous processed run,
+                # so a resumed run never skips a day that was not attempted
+                checkpoint_date = None
+                interrupted = False
+                for date_value, result in zip(month_dates, results):
+                    if result is None:
+                        interrupted = True
+                        break
+                    if result == 'existing':
+                        totals['skipped'] += 1
+                    else:
+                        totals[result] += 1
+                    if result in ('uploaded', 'existing'):
+                        checkpoint_date = date_value
                 
-                # Small delay between requests
-                time.sleep(1)
+                days_since_flush += len(results)
+                if checkpoint_date:
+                    self._pending_checkpoint = checkpoint_date
+                if days_since_flush >= _CHECKPOINT_EVERY_DAYS:
+                    self.flush_checkpoint()
+                    days_since_flush = 0
                 
-            except Exception as e:
-                print(f"Error processing {current_date}: {e}")
-                total_failed += 1
-                current_date -= timedelta(days=1)  # Go backwards
-                continue
+                if interrupted:
+                    log.info("Reached max runtime: %d minutes", max_runtime_minutes)
+                    break
+        finally:
+            self.flush_checkpoint()
+        
+        return totals
+    
+    def scrape_and_upload(self, start_date, end_date=None, max_days_per_run=50, max_runtime_minutes=330):
+        """Scrape PDFs and upload to S3 with runtime limits - Goes BACKWARDS from recent to old"""
+        if end_date is None:
+            end_date = datetime(2007, 6, 1)  # Earliest date
         
-        print(f"\n{'='*60}")
-        print(f"PDF Scraping Complete!")
-        print(f"Total uploaded: {total_uploaded}")
-        print(f"Total skipped: {total_skipped}")
-        print(f"Total failed: {total_failed}")
-        print(f"Runtime: {(time.time() - started_at) / 60:.2f} minutes")
-        print(f"{'='*60}")
+        # Check if we've already gone past the end date
+        if start_date < end_date:
+            log.info("=" * 60)
+            log.info("Already completed! Start date (%s) is before end date (%s)", start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+            log.info("All PDFs from %s onwards have been processed.", end_date.strftime('%Y-%m-%d'))
+            log.info("=" * 60)
+            return
+        
+        started_at = time.time()
+        
+        log.info("=" * 60)
+        log.info("PDF Scraper Started (BACKWARDS: recent → old)")
+        log.info("Starting from: %s", start_date.strftime('%Y-%m-%d'))
+        log.info("Going back to: %s", end_date.strftime('%Y-%m-%d'))
+        log.info("Max days per run: %d", max_days_per_run)
+        log.info("Max runtime: %d minutes", max_runtime_minutes)
+        log.info("Max concurrency: %d", self.max_concurrency)
+        log.info("=" * 60)
+        
+        # Build the list of dates for this run (going backwards)
+        dates = []
+        current_date = start_date
+        while current_date >= end_date and len(dates) < max_days_per_run:
+            dates.append(current_date)
+            current_date -= timedelta(days=1)
+        
+        if current_date >= end_date:
+            log.info("Limiting this run to max days per run: %d", max_days_per_run)
+        
+        try:
+            totals = asyncio.run(self._scrape_and_upload_async(dates, max_runtime_minutes, started_at))
+        finally:
+            self._loop = None
+        
+        log.info("=" * 60)
+        log.info("PDF Scraping Complete!")
+        log.info("Total uploaded: %d", totals['uploaded'])
+        log.info("Total skipped: %d", totals['skipped'])
+        log.info("Total failed: %d", totals['failed'])
+        log.info("Runtime: %.2f minutes", (time.time() - started_at) / 60)
+        log.info("=" * 60)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
+    
     # Get AWS credentials from environment variables
     AWS_ACCESS_KEY = os.getenv('AWS_ACCESS_KEY_ID')
     AWS_SECRET_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
@@ -310,15 +619,15 @@ if __name__ == "__main__":
     
     # Validate credentials are set
     if not AWS_ACCESS_KEY:
-        print("ERROR: AWS_ACCESS_KEY_ID environment variable is not set!")
+        log.error("AWS_ACCESS_KEY_ID environment variable is not set!")
         sys.exit(1)
     
     if not AWS_SECRET_KEY:
-        print("ERROR: AWS_SECRET_ACCESS_KEY environment variable is not set!")
+        log.error("AWS_SECRET_ACCESS_KEY environment variable is not set!")
         sys.exit(1)
     
     if not BUCKET_NAME:
-        print("ERROR: S3_BUCKET_NAME environment variable is not set!")
+        log.error("S3_BUCKET_NAME environment variable is not set!")
         sys.exit(1)
     
     # Strip whitespace
@@ -329,6 +638,12 @@ if __name__ == "__main__":
     # Runtime limits for GitHub Actions (6 hour limit, use 5.5 hours to be safe)
     MAX_DAYS_PER_RUN = int(os.getenv("MAX_DAYS_PER_RUN", "5000"))
     MAX_RUNTIME_MINUTES = int(os.getenv("MAX_RUNTIME_MINUTES", "330"))
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "10"))
+    MAX_REQUESTS_PER_SECOND = float(os.getenv("MAX_REQUESTS_PER_SECOND", "5"))
+    
+    if MAX_REQUESTS_PER_SECOND <= 0:
+        log.error("MAX_REQUESTS_PER_SECOND must be positive (got %s)", MAX_REQUESTS_PER_SECOND)
+        sys.exit(1)
     USE_CHECKPOINT = os.getenv("USE_CHECKPOINT", "1") == "1"
     SCRAPE_MODE = os.getenv("SCRAPE_MODE", "checkpoint")  # 'monthly' or 'checkpoint'
     
@@ -349,16 +664,18 @@ if __name__ == "__main__":
         except:
             pass
     
-    print(f"Initializing PDF scraper...")
-    print(f"S3 Bucket: {BUCKET_NAME}")
-    print(f"AWS Access Key: {AWS_ACCESS_KEY[:4]}...{AWS_ACCESS_KEY[-4:]}")
-    print(f"Scrape Mode: {SCRAPE_MODE}")
+    log.info("Initializing PDF scraper...")
+    log.info("S3 Bucket: %s", BUCKET_NAME)
+    log.info("AWS Access Key: %s...%s", AWS_ACCESS_KEY[:4], AWS_ACCESS_KEY[-4:])
+    log.info("Scrape Mode: %s", SCRAPE_MODE)
     
     # Initialize scraper
     scraper = AljaridaPDFScraper(
         aws_access_key=AWS_ACCESS_KEY,
         aws_secret_key=AWS_SECRET_KEY,
-        bucket_name=BUCKET_NAME
+        bucket_name=BUCKET_NAME,
+        max_concurrency=MAX_CONCURRENCY,
+        max_requests_per_second=MAX_REQUESTS_PER_SECOND
     )
     
     # Handle different scrape modes if no explicit dates provided
@@ -374,17 +691,17 @@ if __name__ == "__main__":
             START_DATE = last_day_previous_month
             END_DATE = first_day_previous_month
             
-            print(f"\n{'='*60}")
-            print(f"MONTHLY MODE: Scraping previous month")
-            print(f"Previous month: {last_day_previous_month.strftime('%B %Y')}")
-            print(f"Date range: {first_day_previous_month.strftime('%Y-%m-%d')} to {last_day_previous_month.strftime('%Y-%m-%d')}")
-            print(f"{'='*60}\n")
+            log.info("=" * 60)
+            log.info("MONTHLY MODE: Scraping previous month")
+            log.info("Previous month: %s", last_day_previous_month.strftime('%B %Y'))
+            log.info("Date range: %s to %s", first_day_previous_month.strftime('%Y-%m-%d'), last_day_previous_month.strftime('%Y-%m-%d'))
+            log.info("=" * 60)
         elif USE_CHECKPOINT:
             # Resume from checkpoint if enabled
             checkpoint_date = scraper.get_last_checkpoint_date()
             if checkpoint_date:
                 START_DATE = checkpoint_date - timedelta(days=1)  # Go one day earlier
-                print(f"Resuming from checkpoint (going backwards): {START_DATE.strftime('%Y-%m-%d')}")
+                log.info("Resuming from checkpoint (going backwards): %s", START_DATE.strftime('%Y-%m-%d'))
     
     # Run scraper
     scraper.scrape_and_upload(